@@ -1,19 +1,45 @@
 """Command-line interface for speculate - AI-powered task graph planning."""
 
 import click
+import io
 import json
+import os
+import re
 import sys
+import time
+from collections import Counter
+from contextlib import redirect_stderr, redirect_stdout
 from pathlib import Path
-from typing import Optional
+from typing import Dict, List, Optional, Set, Tuple
 
-from speculate import __version__
+from speculate import __version__, daemon
 from speculate.graph_engine import (
-    TaskGraph, Task, TaskStatus, RelationType, validate_task_id
+    GraphView, TaskGraph, Task, TaskStatus, RelationType, validate_task_id
 )
-from speculate.mermaid_generator import render_mermaid
 
 
 GRAPH_FILE = Path(".speculate/graph.json")
+GRAPH_LOG = Path(".speculate/graph.log")
+
+# Compact the log into the snapshot once it exceeds this fraction of the snapshot size
+COMPACT_RATIO = 4
+
+DAEMON_SOCKET = Path(".speculate/sock")
+
+# Commands forwarded to a running `speculate serve` daemon when its socket exists
+DAEMON_COMMANDS = {
+    "add", "update", "delete", "batch", "start", "complete", "compact",
+    "validate", "available", "after", "show",
+}
+
+# Set while this process is the `speculate serve` daemon
+_serving = False
+
+# Graph kept in memory by the daemon; None until (re)loaded from disk
+_resident_graph: Optional[TaskGraph] = None
+
+# How long recommended-tool probe results are reused by init (seconds)
+TOOL_CACHE_TTL = 24 * 60 * 60
 
 
 def ensure_graph_dir():
@@ -22,19 +48,205 @@ def ensure_graph_dir():
 
 
 def load_graph() -> TaskGraph:
-    """Load graph from file or create empty graph"""
-    if GRAPH_FILE.exists():
-        return TaskGraph.load(GRAPH_FILE)
-    return TaskGraph()
+    """Load graph from file (replaying any pending log) or create empty graph"""
+    global _resident_graph
+
+    if _resident_graph is not None:
+        return _resident_graph
+
+    graph = TaskGraph.load(GRAPH_FILE) if GRAPH_FILE.exists() else TaskGraph()
+    if GRAPH_LOG.exists():
+        graph.replay_log(GRAPH_LOG)
+    # The daemon keeps the graph only once it has loaded successfully
+    if _serving:
+        _resident_graph = graph
+    return graph
+
+
+def load_graph_view() -> GraphView:
+    """Load a read-only view of the graph for query commands"""
+    # The daemon answers from its resident graph instead of re-reading the files
+    if _serving:
+        return load_graph().view()
+
+    view = TaskGraph.load_view(GRAPH_FILE) if GRAPH_FILE.exists() else GraphView()
+    if GRAPH_LOG.exists():
+        view.replay_log(GRAPH_LOG)
+    return view
 
 
 def save_graph(graph: TaskGraph):
-    """Save graph to file atomically"""
+    """Save graph to file atomically and drop the now-redundant log"""
     ensure_graph_dir()
     graph.save(GRAPH_FILE)
+    TaskGraph.discard_log(GRAPH_LOG)
+
+
+def log_updates(graph: TaskGraph, updates: List[Tuple[str, dict]]):
+    """Record task updates (task ID, fields) in the append-only log instead of rewriting the graph"""
+    ensure_graph_dir()
+    graph.append_ops(GRAPH_LOG, [
+        {**fields, "op": "update", "id": task_id} for task_id, fields in updates
+    ])
+
+    snapshot_size = GRAPH_FILE.stat().st_size if GRAPH_FILE.exists() else 0
+    if GRAPH_LOG.stat().st_size * COMPACT_RATIO > snapshot_size:
+        save_graph(graph)
+
+
+def _tool_cache_file() -> Path:
+    """Location of the cached recommended-tool probe results"""
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_home) / "speculate" / "tools.json"
+
+
+def clear_tool_cache():
+    """Forget cached tool probe results"""
+    try:
+        _tool_cache_file().unlink()
+    except OSError:
+        pass
+
+
+def detect_tools(tools: List[str]) -> Dict[str, bool]:
+    """Check which tools are on PATH, reusing results cached within the TTL"""
+    cache_file = _tool_cache_file()
+    try:
+        cache = json.loads(cache_file.read_text())
+        if time.time() - cache["checked_at"] < TOOL_CACHE_TTL and set(tools) <= cache["tools"].keys():
+            return {tool: cache["tools"][tool] for tool in tools}
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        pass
+
+    import shutil
+    from concurrent.futures import ThreadPoolExecutor
+
+    # Probe PATH for all tools concurrently instead of one after another
+    with ThreadPoolExecutor(max_workers=len(tools) or 1) as executor:
+        presence = {
+            tool: path is not None
+            for tool, path in zip(tools, executor.map(shutil.which, tools))
+        }
+
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        cache_file.write_text(json.dumps({"checked_at": time.time(), "tools": presence}))
+    except OSError:
+        pass
+    return presence
+
+
+# Package-manager messages naming a package it does not know
+# (apt, dnf, pacman, brew)
+_UNKNOWN_PACKAGE_RE = re.compile(
+    r'Unable to locate package (\S+)'
+    r'|No match for argument: (\S+)'
+    r'|target not found: (\S+)'
+    r'|No available formula with the name "([^"]+)"'
+)
+
+
+def install_packages(pkg_manager: str, packages: Dict[str, str]) -> Set[str]:
+    """Install packages (tool -> package name). Returns the tools now available.
+
+    Everything goes into one package-manager transaction. Managers like apt
+    abort the whole transaction when any package is unknown, so unknown
+    packages named in the error output are dropped and the rest retried as
+    one batch. Other failures (e.g. missing permissions) are not retried.
+    """
+    import shutil
+    import subprocess
+
+    pending = dict(packages)
+    while pending:
+        try:
+            result = subprocess.run(
+                [*pkg_manager.split(), *pending.values()], capture_output=True, text=True
+            )
+        except Exception:
+            break
+        if result.returncode == 0:
+            return set(pending)
+
+        unknown = {
+            name for match in _UNKNOWN_PACKAGE_RE.finditer(f"{result.stdout}\n{result.stderr}")
+            for name in match.groups() if name
+        }
+        retry = {tool: package for tool, package in pending.items() if package not in unknown}
+        if len(retry) == len(pending):
+            break
+        pending = retry
+
+    return {tool for tool in packages if shutil.which(tool)}
+
+
+class SpeculateGroup(click.Group):
+    """Command group that hands commands to a running daemon when available"""
+
+    def main(self, args=None, **extra):
+        if not _serving:
+            argv = sys.argv[1:] if args is None else list(args)
+            if argv and argv[0] in DAEMON_COMMANDS:
+                sock = daemon.connect(DAEMON_SOCKET)
+                if sock is not None:
+                    _forward_to_daemon(sock, argv)
+        return super().main(args, **extra)
+
+
+def _forward_to_daemon(sock, argv: List[str]):
+    """Run a command in the daemon, replay its output here and exit"""
+    request = {"args": argv}
+    if argv[0] == "batch" and argv[1:] in ([], ["-"]):
+        request["stdin"] = sys.stdin.read()
+
+    try:
+        response = daemon.send_request(sock, request)
+    except (OSError, ValueError) as e:
+        click.echo(f"Error: Lost connection to speculate daemon: {e}", err=True)
+        sys.exit(1)
+
+    sys.stdout.write(response["stdout"])
+    sys.stderr.write(response["stderr"])
+    sys.exit(response["exit_code"])
+
+
+def _run_resident(request: dict) -> dict:
+    """Run one forwarded command against the resident graph"""
+    global _resident_graph
 
+    stdout = io.TextIOWrapper(io.BytesIO(), encoding="utf-8")
+    stderr = io.TextIOWrapper(io.BytesIO(), encoding="utf-8")
+    real_stdin = sys.stdin
+    sys.stdin = io.TextIOWrapper(io.BytesIO(request.get("stdin", "").encode("utf-8")), encoding="utf-8")
+    try:
+        with redirect_stdout(stdout), redirect_stderr(stderr):
+            try:
+                main.main(args=request["args"], prog_name="speculate")
+                exit_code = 0
+            except SystemExit as e:
+                exit_code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+            except Exception as e:
+                click.echo(f"Error: {e}", err=True)
+                exit_code = 1
+    finally:
+        sys.stdin = real_stdin
+
+    # A failed command may have mutated the graph before bailing out without
+    # saving, so drop the resident copy; the next command reloads it from disk
+    # (and reports the error itself if the files on disk cannot be loaded)
+    if exit_code != 0:
+        _resident_graph = None
+
+    stdout.flush()
+    stderr.flush()
+    return {
+        "exit_code": exit_code,
+        "stdout": stdout.buffer.getvalue().decode("utf-8"),
+        "stderr": stderr.buffer.getvalue().decode("utf-8"),
+    }
 
-@click.group()
+
+@click.group(cls=SpeculateGroup)
 @click.version_option(version=__version__)
 def main():
     """Speculate - AI-powered task graph planning.
@@ -115,34 +327,37 @@ def init(force, no_install_tools):
         'fzf': f'{pkg_manager} fzf'
     }
 
-    missing_tools = []
-    for tool, install_cmd in recommended_tools.items():
-        if not shutil.which(tool):
-            missing_tools.append((tool, install_cmd))
+    presence = detect_tools(list(recommended_tools))
+    missing_tools = [
+        (tool, install_cmd) for tool, install_cmd in recommended_tools.items()
+        if not presence[tool]
+    ]
 
     if missing_tools:
         if not no_install_tools:
             # Attempt to install missing tools (default behavior)
             click.echo(f"\n📦 Installing recommended tools...")
-            import subprocess
 
             failed_installs = []
-            for tool, install_cmd in missing_tools:
-                try:
-                    # Parse the install command
-                    if pkg_manager != "# (install via package manager)" and pkg_manager != "# (use your package manager)":
-                        click.echo(f"  {tool}...", nl=False)
-                        result = subprocess.run(install_cmd.split(), capture_output=True, text=True)
-                        if result.returncode != 0:
-                            click.secho(f" ✗", fg='red')
-                            failed_installs.append((tool, install_cmd))
-                        else:
-                            click.secho(f" ✓", fg='green')
+            if pkg_manager != "# (install via package manager)" and pkg_manager != "# (use your package manager)":
+                packages = {
+                    tool: install_cmd[len(pkg_manager):].strip()
+                    for tool, install_cmd in missing_tools
+                }
+                installed = install_packages(pkg_manager, packages)
+
+                for tool, install_cmd in missing_tools:
+                    click.echo(f"  {tool}...", nl=False)
+                    if tool in installed:
+                        click.secho(f" ✓", fg='green')
                     else:
+                        click.secho(f" ✗", fg='red')
                         failed_installs.append((tool, install_cmd))
-                except Exception as e:
-                    click.secho(f" ✗", fg='red')
-                    failed_installs.append((tool, install_cmd))
+            else:
+                failed_installs.extend(missing_tools)
+
+            # Installs changed what is on PATH, so re-probe next time
+            clear_tool_cache()
 
             if failed_installs:
                 click.echo(f"\n⚠️  Some tools could not be installed automatically:")
@@ -158,70 +373,62 @@ def init(force, no_install_tools):
 
 
 # ============================================================================
-# Write Commands (modify graph, auto-save)
+# Graph Operations (shared by the single-op commands and batch)
 # ============================================================================
 
-@main.command()
-@click.argument('json_payload')
-def add(json_payload):
-    """Add tasks and relationships from JSON.
-
-    Example:
-        speculate add '{"tasks": [{"id": "design-api", "estimate_hours": 2}]}'
-    """
+def parse_payload(json_payload: str) -> dict:
+    """Parse a JSON command payload, exiting with an error if it is invalid"""
     try:
-        data = json.loads(json_payload)
+        return json.loads(json_payload)
     except json.JSONDecodeError as e:
-        click.echo(f"Error: Invalid JSON: {e}", err=True)
-        sys.exit(1)
+        raise click.ClickException(f"Invalid JSON: {e}")
 
-    graph = load_graph()
 
+def _apply_add(graph: TaskGraph, data: dict) -> Tuple[int, int]:
+    """Validate and add tasks and relationships. Returns (tasks, relationships) added"""
     if "tasks" not in data and "relationships" not in data:
-        click.echo("Error: JSON must contain 'tasks' and/or 'relationships'", err=True)
-        sys.exit(1)
+        raise click.ClickException("JSON must contain 'tasks' and/or 'relationships'")
 
     tasks_to_add = data.get("tasks", [])
     relationships_to_add = data.get("relationships", [])
 
-    # Validate all tasks
-    for task_data in tasks_to_add:
-        if "id" not in task_data:
-            click.echo("Error: Each task must have an 'id' field", err=True)
-            sys.exit(1)
+    # Validate all tasks, reporting every problem of a kind at once
+    if any("id" not in task_data for task_data in tasks_to_add):
+        raise click.ClickException("Each task must have an 'id' field")
 
-        task_id = task_data["id"]
-        is_valid, error = validate_task_id(task_id)
-        if not is_valid:
-            click.echo(f"Error: {error}", err=True)
-            sys.exit(1)
+    ids = [task_data["id"] for task_data in tasks_to_add]
+    errors = [error for is_valid, error in map(validate_task_id, ids) if not is_valid]
+    if errors:
+        raise click.ClickException("\n".join(errors))
 
-        if task_id in graph.nodes:
-            click.echo(f"Error: Task ID already exists: {task_id}", err=True)
-            sys.exit(1)
+    repeated = [task_id for task_id, count in Counter(ids).items() if count > 1]
+    if repeated:
+        raise click.ClickException(f"Task ID repeated in payload: {', '.join(repeated)}")
+
+    conflicts = sorted(set(ids) & graph.nodes.keys())
+    if conflicts:
+        raise click.ClickException(f"Task ID already exists: {', '.join(conflicts)}")
 
     # Validate relationships
+    all_task_ids = set(graph.nodes)
+    all_task_ids.update(ids)
     for rel in relationships_to_add:
         if "from" not in rel or "to" not in rel or "type" not in rel:
-            click.echo("Error: Each relationship must have 'from', 'to', and 'type' fields", err=True)
-            sys.exit(1)
-
-        all_task_ids = set(graph.nodes.keys()) | {t["id"] for t in tasks_to_add}
+            raise click.ClickException("Each relationship must have 'from', 'to', and 'type' fields")
 
         if rel["from"] not in all_task_ids:
-            click.echo(f"Error: Relationship references non-existent task: {rel['from']}", err=True)
-            sys.exit(1)
+            raise click.ClickException(f"Relationship references non-existent task: {rel['from']}")
 
         if rel["to"] not in all_task_ids:
-            click.echo(f"Error: Relationship references non-existent task: {rel['to']}", err=True)
-            sys.exit(1)
+            raise click.ClickException(f"Relationship references non-existent task: {rel['to']}")
 
         try:
             RelationType(rel["type"])
         except ValueError:
-            click.echo(f"Error: Invalid relationship type: {rel['type']}", err=True)
-            click.echo(f"Valid types: blocks, relates_to, part_of", err=True)
-            sys.exit(1)
+            raise click.ClickException(
+                f"Invalid relationship type: {rel['type']}\n"
+                f"Valid types: blocks, relates_to, part_of"
+            )
 
     # Add tasks
     for task_data in tasks_to_add:
@@ -243,74 +450,53 @@ def add(json_payload):
             RelationType(rel["type"])
         )
 
-    save_graph(graph)
-    click.echo(f"Added {len(tasks_to_add)} task(s) and {len(relationships_to_add)} relationship(s)")
+    return len(tasks_to_add), len(relationships_to_add)
 
 
-@main.command()
-@click.argument('json_payload')
-def update(json_payload):
-    """Update task properties from JSON.
+def _apply_update(graph: TaskGraph, data: dict, log: bool = False) -> int:
+    """Validate and apply task updates. Returns the number of tasks updated.
 
-    Example:
-        speculate update '{"tasks": [{"id": "design-api", "estimate_hours": 3}]}'
+    With log=True the updates are appended to the update log instead of only
+    being applied in memory.
     """
-    try:
-        data = json.loads(json_payload)
-    except json.JSONDecodeError as e:
-        click.echo(f"Error: Invalid JSON: {e}", err=True)
-        sys.exit(1)
-
-    graph = load_graph()
     tasks_to_update = data.get("tasks", [])
 
     if not tasks_to_update:
-        click.echo("Error: JSON must contain 'tasks' array", err=True)
-        sys.exit(1)
+        raise click.ClickException("JSON must contain 'tasks' array")
 
     # Validate
     for task_data in tasks_to_update:
         if "id" not in task_data:
-            click.echo("Error: Each task must have an 'id' field", err=True)
-            sys.exit(1)
+            raise click.ClickException("Each task must have an 'id' field")
 
         if task_data["id"] not in graph.nodes:
-            click.echo(f"Error: Task not found: {task_data['id']}", err=True)
-            sys.exit(1)
+            raise click.ClickException(f"Task not found: {task_data['id']}")
 
         if "status" in task_data:
             try:
                 TaskStatus(task_data["status"])
             except ValueError:
-                click.echo(f"Error: Invalid status: {task_data['status']}", err=True)
-                click.echo(f"Valid statuses: pending, in_progress, done", err=True)
-                sys.exit(1)
+                raise click.ClickException(
+                    f"Invalid status: {task_data['status']}\n"
+                    f"Valid statuses: pending, in_progress, done"
+                )
 
     # Apply updates
-    for task_data in tasks_to_update:
-        task_id = task_data["id"]
-        updates = {k: v for k, v in task_data.items() if k != "id"}
-        graph.update_task(task_id, **updates)
-
-    save_graph(graph)
-    click.echo(f"Updated {len(tasks_to_update)} task(s)")
-
+    updates = [
+        (task_data["id"], {k: v for k, v in task_data.items() if k != "id"})
+        for task_data in tasks_to_update
+    ]
+    if log:
+        log_updates(graph, updates)
+    else:
+        for task_id, fields in updates:
+            graph.update_task(task_id, **fields)
 
-@main.command()
-@click.argument('json_payload')
-def delete(json_payload):
-    """Delete tasks and relationships from JSON.
+    return len(tasks_to_update)
 
-    Example:
-        speculate delete '{"tasks": ["old-task"]}'
-    """
-    try:
-        data = json.loads(json_payload)
-    except json.JSONDecodeError as e:
-        click.echo(f"Error: Invalid JSON: {e}", err=True)
-        sys.exit(1)
 
-    graph = load_graph()
+def _apply_delete(graph: TaskGraph, data: dict) -> Tuple[int, int]:
+    """Delete tasks and relationships. Returns (tasks, relationships) deleted"""
     tasks_to_delete = data.get("tasks", [])
     relationships_to_delete = data.get("relationships", [])
 
@@ -329,10 +515,102 @@ def delete(json_payload):
             after_count = len(graph.edges)
             deleted_rels += (before_count - after_count)
 
+    return deleted_tasks, deleted_rels
+
+
+BATCH_OPS = {
+    "add": _apply_add,
+    "update": _apply_update,
+    "delete": _apply_delete,
+}
+
+
+# ============================================================================
+# Write Commands (modify graph, auto-save)
+# ============================================================================
+
+@main.command()
+@click.argument('json_payload')
+def add(json_payload):
+    """Add tasks and relationships from JSON.
+
+    Example:
+        speculate add '{"tasks": [{"id": "design-api", "estimate_hours": 2}]}'
+    """
+    data = parse_payload(json_payload)
+    graph = load_graph()
+    added_tasks, added_rels = _apply_add(graph, data)
+    save_graph(graph)
+    click.echo(f"Added {added_tasks} task(s) and {added_rels} relationship(s)")
+
+
+@main.command()
+@click.argument('json_payload')
+def update(json_payload):
+    """Update task properties from JSON.
+
+    Example:
+        speculate update '{"tasks": [{"id": "design-api", "estimate_hours": 3}]}'
+    """
+    data = parse_payload(json_payload)
+    graph = load_graph()
+    updated = _apply_update(graph, data, log=True)
+    click.echo(f"Updated {updated} task(s)")
+
+
+@main.command()
+@click.argument('json_payload')
+def delete(json_payload):
+    """Delete tasks and relationships from JSON.
+
+    Example:
+        speculate delete '{"tasks": ["old-task"]}'
+    """
+    data = parse_payload(json_payload)
+    graph = load_graph()
+    deleted_tasks, deleted_rels = _apply_delete(graph, data)
     save_graph(graph)
     click.echo(f"Deleted {deleted_tasks} task(s) and {deleted_rels} relationship(s)")
 
 
+@main.command()
+@click.argument('source', type=click.File('r'), default='-')
+def batch(source):
+    """Apply many add/update/delete operations with a single load and save.
+
+    Reads {"ops": [{"op": "add", "payload": {...}}, ...]} from SOURCE
+    (stdin by default). Nothing is saved if any operation fails.
+
+    Example:
+        echo '{"ops": [{"op": "delete", "payload": {"tasks": ["old-task"]}}]}' | speculate batch
+    """
+    data = parse_payload(source.read())
+    ops = data.get("ops") if isinstance(data, dict) else None
+    if not isinstance(ops, list):
+        raise click.ClickException("JSON must contain an 'ops' array")
+
+    graph = load_graph()
+    for i, record in enumerate(ops, 1):
+        if not isinstance(record, dict):
+            raise click.ClickException(f"Operation {i}: must be an object, got {record!r}")
+        op = record.get("op")
+        apply_op = BATCH_OPS.get(op) if isinstance(op, str) else None
+        if apply_op is None:
+            raise click.ClickException(
+                f"Operation {i}: unknown op {record.get('op')!r} (valid: add, update, delete)"
+            )
+        payload = record.get("payload", {})
+        if not isinstance(payload, dict):
+            raise click.ClickException(f"Operation {i} ({op}): payload must be an object")
+        try:
+            apply_op(graph, payload)
+        except click.ClickException as e:
+            raise click.ClickException(f"Operation {i} ({op}): {e.message}")
+
+    save_graph(graph)
+    click.echo(f"Applied {len(ops)} operation(s)")
+
+
 @main.command()
 @click.argument('task_id')
 def start(task_id):
@@ -347,8 +625,7 @@ def start(task_id):
         click.echo(f"Error: Task not found: {task_id}", err=True)
         sys.exit(1)
 
-    graph.update_task(task_id, status=TaskStatus.IN_PROGRESS)
-    save_graph(graph)
+    log_updates(graph, [(task_id, {"status": TaskStatus.IN_PROGRESS.value})])
     click.echo(f"Started task: {task_id}")
 
 
@@ -366,11 +643,49 @@ def complete(task_id):
         click.echo(f"Error: Task not found: {task_id}", err=True)
         sys.exit(1)
 
-    graph.update_task(task_id, status=TaskStatus.DONE)
-    save_graph(graph)
+    log_updates(graph, [(task_id, {"status": TaskStatus.DONE.value})])
     click.echo(f"Completed task: {task_id}")
 
 
+@main.command()
+def compact():
+    """Fold the pending update log into graph.json.
+
+    start, complete and update append to .speculate/graph.log instead of
+    rewriting the whole graph; the log is compacted automatically once it
+    grows, or on demand with this command.
+    """
+    if not GRAPH_LOG.exists():
+        click.echo("Nothing to compact")
+        return
+
+    save_graph(load_graph())
+    click.echo("Compacted update log into graph")
+
+
+@main.command()
+def serve():
+    """Keep the graph in memory and answer commands over a local socket.
+
+    While this runs, other speculate commands in the same directory are
+    sent to it over .speculate/sock, skipping interpreter startup and graph
+    parsing. Stop with Ctrl-C.
+    """
+    global _serving, _resident_graph
+
+    ensure_graph_dir()
+    _serving = True
+    try:
+        graph = load_graph()
+        click.echo(f"Serving {len(graph.nodes)} task(s) on {DAEMON_SOCKET}")
+        daemon.serve(DAEMON_SOCKET, _run_resident)
+    except RuntimeError as e:
+        raise click.ClickException(str(e))
+    finally:
+        _serving = False
+        _resident_graph = None
+
+
 @main.command()
 def validate():
     """Validate graph health - check for cycles, orphans, and integrity issues."""
@@ -440,6 +755,8 @@ def available():
     Ready tasks (green) can be started immediately.
     Blocked tasks (gray) are waiting on dependencies.
     """
+    from speculate.mermaid_generator import render_mermaid
+
     graph = load_graph()
 
     if not graph.nodes:
@@ -449,7 +766,9 @@ def available():
     mermaid = render_mermaid(
         graph,
         highlight_ready=True,
-        filter_pending_only=True
+        filter_pending_only=True,
+        # The daemon only changes its resident graph through TaskGraph methods
+        cache=_serving
     )
     click.echo(mermaid)
 
@@ -465,6 +784,8 @@ def after(task_id):
     Example:
         speculate after design-api
     """
+    from speculate.mermaid_generator import render_mermaid
+
     graph = load_graph()
 
     if task_id not in graph.nodes:
@@ -474,7 +795,8 @@ def after(task_id):
     mermaid = render_mermaid(
         graph,
         highlight_downstream=task_id,
-        filter_pending_only=True
+        filter_pending_only=True,
+        cache=_serving
     )
     click.echo(mermaid)
 
@@ -487,51 +809,53 @@ def show(task_id):
     Example:
         speculate show design-api
     """
-    graph = load_graph()
+    graph = load_graph_view()
 
     if task_id not in graph.nodes:
         click.echo(f"Error: Task not found: {task_id}", err=True)
         sys.exit(1)
 
     task = graph.nodes[task_id]
+    done, pending = TaskStatus.DONE.value, TaskStatus.PENDING.value
 
-    click.echo(f"Task: {task.id}")
-    click.echo(f"Status: {task.status.value}")
+    click.echo(f"Task: {task['id']}")
+    click.echo(f"Status: {task.get('status', pending)}")
 
-    if task.description:
+    if task.get("description"):
         click.echo(f"\nDescription:")
-        click.echo(f"  {task.description}")
+        click.echo(f"  {task['description']}")
 
-    if task.estimate_hours:
-        click.echo(f"\nEstimate: {task.estimate_hours}h")
+    if task.get("estimate_hours"):
+        click.echo(f"\nEstimate: {task['estimate_hours']}h")
 
-    if task.acceptance_criteria:
+    if task.get("acceptance_criteria"):
         click.echo(f"\nAcceptance Criteria:")
-        for i, criterion in enumerate(task.acceptance_criteria, 1):
+        for i, criterion in enumerate(task["acceptance_criteria"], 1):
             click.echo(f"  {i}. {criterion}")
 
-    if task.checklist:
+    checklist = task.get("checklist")
+    if checklist:
         click.echo(f"\nChecklist:")
-        completed, total = task.checklist_progress()
-        click.echo(f"  Progress: {completed}/{total}")
-        for item in task.checklist:
+        completed = sum(1 for item in checklist if item.get("done", False))
+        click.echo(f"  Progress: {completed}/{len(checklist)}")
+        for item in checklist:
             status = "✓" if item.get("done", False) else "○"
             click.echo(f"  {status} {item['item']}")
 
     # Show blocking dependencies
-    blockers = graph.get_blocking_dependencies(task.id)
+    blockers = graph.get_blocking_dependencies(task_id)
     if blockers:
         click.echo(f"\nBlocked by:")
         for blocker in blockers:
-            status_icon = "✓" if blocker.is_complete() else "○"
-            click.echo(f"  {status_icon} {blocker.id} ({blocker.status.value})")
+            status_icon = "✓" if blocker.get("status") == done else "○"
+            click.echo(f"  {status_icon} {blocker['id']} ({blocker.get('status', pending)})")
 
     # Show blocked tasks
-    blocked = graph.get_blocked_tasks(task.id)
+    blocked = graph.get_blocked_tasks(task_id)
     if blocked:
         click.echo(f"\nBlocks:")
         for b in blocked:
-            click.echo(f"  - {b.id} ({b.status.value})")
+            click.echo(f"  - {b['id']} ({b.get('status', pending)})")
 
 
 if __name__ == '__main__':
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Unix socket daemon that keeps a task graph resident between CLI calls
+"""
+
+import json
+import socket
+from pathlib import Path
+from typing import Callable, Optional
+
+
+def connect(sock_path: Path) -> Optional[socket.socket]:
+    """Connect to a running daemon. Returns None if none is listening"""
+    if not hasattr(socket, "AF_UNIX") or not sock_path.exists():
+        return None
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(str(sock_path))
+    except OSError:
+        # Stale socket file left behind by a daemon that is no longer running
+        sock.close()
+        return None
+    return sock
+
+
+def send_request(sock: socket.socket, request: dict) -> dict:
+    """Send one request over a connected socket and wait for the response"""
+    with sock:
+        sock.sendall(json.dumps(request).encode("utf-8"))
+        sock.shutdown(socket.SHUT_WR)
+
+        chunks = []
+        while True:
+            chunk = sock.recv(1 << 16)
+            if not chunk:
+                break
+            chunks.append(chunk)
+
+    if not chunks:
+        raise ConnectionError("Daemon closed the connection without responding")
+    return json.loads(b"".join(chunks))
+
+
+def serve(sock_path: Path, handle: Callable[[dict], dict]) -> None:
+    """
+    Serve requests on a Unix socket until interrupted.
+
+    Each connection carries one JSON request (terminated by the client
+    closing its write side) and receives one JSON response. Requests are
+    handled one at a time, so handlers can mutate shared state freely.
+    """
+    if not hasattr(socket, "AF_UNIX"):
+        raise RuntimeError("Daemon mode requires Unix domain sockets")
+
+    # Only the server needs asyncio; clients skip its import cost
+    import asyncio
+    import signal
+
+    existing = connect(sock_path)
+    if existing is not None:
+        existing.close()
+        raise RuntimeError(f"A daemon is already listening on {sock_path}")
+    if sock_path.exists():
+        sock_path.unlink()
+
+    async def on_client(reader: "asyncio.StreamReader", writer: "asyncio.StreamWriter") -> None:
+        try:
+            response = handle(json.loads(await reader.read()))
+        except Exception as e:
+            response = {"exit_code": 1, "stdout": "", "stderr": f"Error: {e}\n"}
+        writer.write(json.dumps(response).encode("utf-8"))
+        await writer.drain()
+        writer.close()
+
+    async def run() -> None:
+        server = await asyncio.start_unix_server(on_client, path=str(sock_path))
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, server.close)
+            except (RuntimeError, ValueError):  # not running in the main thread
+                pass
+        async with server:
+            try:
+                await server.serve_forever()
+            except asyncio.CancelledError:
+                pass
+
+    try:
+        asyncio.run(run())
+    finally:
+        if sock_path.exists():
+            sock_path.unlink()
@@ -4,12 +4,92 @@ Graph-based task planner
 Generates optimal task graphs from user goals
 """
 
-from dataclasses import dataclass, field
-from typing import List, Optional, Dict, Set, Tuple
+from collections import deque
+from collections.abc import Mapping
+from itertools import count
+from dataclasses import dataclass, field, fields
+from typing import Iterator, List, Optional, Dict, Set, Tuple, Union
 from enum import Enum
 import json
+import mmap
+import os
 from pathlib import Path
 import re
+import sys
+
+try:
+    import orjson
+except ImportError:  # optional: pip install speculate[fast]
+    orjson = None
+
+
+def _dumps(data: dict) -> bytes:
+    """Encode JSON as indented UTF-8 bytes, using orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+def _dumps_line(data: dict) -> bytes:
+    """Encode JSON as a single newline-terminated UTF-8 line"""
+    if orjson is not None:
+        return orjson.dumps(data) + b"\n"
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n"
+
+
+def _loads(raw: Union[str, bytes]) -> dict:
+    """Decode JSON from bytes or str, using orjson when available"""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _fsync_dir(dirpath: Path) -> None:
+    """Flush a directory entry so a preceding rename survives a crash"""
+    if not hasattr(os, "O_DIRECTORY"):  # e.g. Windows
+        return
+    dir_fd = os.open(str(dirpath), os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(dir_fd)
+    finally:
+        os.close(dir_fd)
+
+
+def _read_json_file(filepath: Path) -> dict:
+    """Parse a JSON file through a read-only memory map"""
+    with open(filepath, 'rb') as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty file cannot be mapped
+            return _loads(b"")
+    with mm:
+        if orjson is not None:
+            with memoryview(mm) as mv:
+                return orjson.loads(mv)
+        return json.loads(mm[:])
+
+
+# Distinguishes TaskGraph instances in cache keys (id() can be reused after GC)
+_GRAPH_SERIALS = count()
+
+# Append-only fds for write-ahead logs, kept open for the life of the process
+_LOG_FDS: Dict[str, int] = {}
+
+
+def _read_log(log_path: Path) -> Iterator[dict]:
+    """Yield write-ahead log records, skipping a torn trailing line"""
+    with open(log_path, 'rb') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                yield _loads(line)
+            except ValueError:
+                continue
+
+
+# __slots__ dataclasses drop the per-instance __dict__ (Python 3.10+)
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
 
 
 class TaskStatus(Enum):
@@ -24,7 +104,7 @@ class RelationType(Enum):
     PART_OF = "part_of"        # A is part of epic/group B (grouping)
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class Task:
     """A node in the task graph - ID is the display name"""
     id: str  # Kebab-case, max 4 words, verb-first (e.g., "design-2fa-flow")
@@ -57,7 +137,7 @@ class Task:
     @classmethod
     def from_dict(cls, data: dict) -> "Task":
         return cls(
-            id=data["id"],
+            id=sys.intern(data["id"]),
             description=data.get("description", ""),
             status=TaskStatus(data.get("status", "pending")),
             acceptance_criteria=data.get("acceptance_criteria", []),
@@ -66,7 +146,7 @@ class Task:
         )
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class Relationship:
     """An edge in the task graph"""
     from_task: str  # task ID
@@ -83,12 +163,19 @@ class Relationship:
     @classmethod
     def from_dict(cls, data: dict) -> "Relationship":
         return cls(
-            from_task=data["from"],
-            to_task=data["to"],
+            from_task=sys.intern(data["from"]),
+            to_task=sys.intern(data["to"]),
             relation_type=RelationType(data["type"])
         )
 
 
+# Task attributes that updates may set (methods and the ID key are excluded)
+_UPDATABLE_TASK_FIELDS = frozenset(f.name for f in fields(Task)) - {"id"}
+
+
+_TASK_ID_RE = re.compile(r'^[a-z0-9]+(-[a-z0-9]+)*\Z')
+
+
 def validate_task_id(task_id: str) -> Tuple[bool, Optional[str]]:
     """
     Validate task ID follows atomic naming rules:
@@ -98,8 +185,8 @@ def validate_task_id(task_id: str) -> Tuple[bool, Optional[str]]:
 
     Returns (is_valid, error_message)
     """
-    # Check for uppercase
-    if task_id != task_id.lower():
+    # Check for uppercase (islower() is allocation-free for the common all-lowercase case)
+    if not task_id.islower() and task_id != task_id.lower():
         return (False, f"Task ID must be lowercase: '{task_id}'")
 
     # Check for spaces
@@ -107,7 +194,7 @@ def validate_task_id(task_id: str) -> Tuple[bool, Optional[str]]:
         return (False, f"Task ID must use hyphens, not spaces: '{task_id}'")
 
     # Check kebab-case pattern
-    if not re.match(r'^[a-z0-9]+(-[a-z0-9]+)*$', task_id):
+    if not _TASK_ID_RE.match(task_id):
         return (False, f"Task ID must be kebab-case (lowercase alphanumeric with hyphens): '{task_id}'")
 
     # Check word count (max 4 words)
@@ -124,6 +211,42 @@ class TaskGraph:
     def __init__(self):
         self.nodes: Dict[str, Task] = {}
         self.edges: List[Relationship] = []
+        # Adjacency indexes mirroring self.edges: relation type -> task ID -> neighbor IDs.
+        # Neighbors are kept as insertion-ordered dicts so traversal order is stable.
+        self._out: Dict[RelationType, Dict[str, Dict[str, None]]] = {rt: {} for rt in RelationType}
+        self._in: Dict[RelationType, Dict[str, Dict[str, None]]] = {rt: {} for rt in RelationType}
+        self._blocks_out = self._out[RelationType.BLOCKS]
+        self._blocks_in = self._in[RelationType.BLOCKS]
+        # Bumped by every mutating method; see cache_token()
+        self._serial = next(_GRAPH_SERIALS)
+        self._version = 0
+        # Bumped by each save; log records from an older generation are
+        # already part of the snapshot and are not replayed
+        self.log_generation = 0
+
+    def _index_edge(self, rel: Relationship) -> None:
+        """Record an edge in the adjacency indexes"""
+        self._out[rel.relation_type].setdefault(rel.from_task, {})[rel.to_task] = None
+        self._in[rel.relation_type].setdefault(rel.to_task, {})[rel.from_task] = None
+
+    def _has_edge(self, from_id: str, to_id: str, rel_type: RelationType) -> bool:
+        """Check whether an edge already exists"""
+        return to_id in self._out[rel_type].get(from_id, ())
+
+    def _unindex_edge(self, from_id: str, to_id: str, rel_type: RelationType) -> bool:
+        """Drop an edge from the adjacency indexes. Returns True if it was present"""
+        out_map, in_map = self._out[rel_type], self._in[rel_type]
+        successors = out_map.get(from_id)
+        if not successors or to_id not in successors:
+            return False
+        del successors[to_id]
+        if not successors:
+            del out_map[from_id]
+        predecessors = in_map[to_id]
+        del predecessors[from_id]
+        if not predecessors:
+            del in_map[to_id]
+        return True
 
     def add_task(self, task: Task) -> None:
         """Add a task to the graph"""
@@ -135,30 +258,54 @@ class TaskGraph:
         if task.id in self.nodes:
             raise ValueError(f"Task ID already exists: {task.id}")
 
+        task.id = sys.intern(task.id)
         self.nodes[task.id] = task
+        self._version += 1
 
-    def update_task(self, task_id: str, **updates) -> None:
+    def update_task(self, task_id: str, /, **updates) -> None:
         """Update task properties"""
         if task_id not in self.nodes:
             raise ValueError(f"Task not found: {task_id}")
 
         task = self.nodes[task_id]
+        self._version += 1
         for key, value in updates.items():
             if key == "status" and isinstance(value, str):
                 value = TaskStatus(value)
-            if hasattr(task, key):
+            if key in _UPDATABLE_TASK_FIELDS:
                 setattr(task, key, value)
 
     def delete_task(self, task_id: str) -> None:
         """Delete task and cascade relationships"""
+        self._version += 1
         if task_id in self.nodes:
             del self.nodes[task_id]
 
-        # Remove all relationships involving this task
-        self.edges = [
-            edge for edge in self.edges
-            if edge.from_task != task_id and edge.to_task != task_id
-        ]
+        # Remove mirror entries of this task's own edges from the indexes
+        has_edges = False
+        for rel_type in RelationType:
+            out_map, in_map = self._out[rel_type], self._in[rel_type]
+            for dst in out_map.pop(task_id, ()):
+                has_edges = True
+                predecessors = in_map.get(dst)
+                if predecessors is not None:
+                    predecessors.pop(task_id, None)
+                    if not predecessors:
+                        del in_map[dst]
+            for src in in_map.pop(task_id, ()):
+                has_edges = True
+                successors = out_map.get(src)
+                if successors is not None:
+                    successors.pop(task_id, None)
+                    if not successors:
+                        del out_map[src]
+
+        # Only rebuild the edge list when this task actually had relationships
+        if has_edges:
+            self.edges = [
+                edge for edge in self.edges
+                if edge.from_task != task_id and edge.to_task != task_id
+            ]
 
     def add_relationship(self, from_id: str, to_id: str, rel_type: RelationType) -> None:
         """Add a relationship between tasks"""
@@ -167,22 +314,30 @@ class TaskGraph:
         if to_id not in self.nodes:
             raise ValueError(f"Target task not found: {to_id}")
 
-        # Avoid duplicates
-        for rel in self.edges:
-            if rel.from_task == from_id and rel.to_task == to_id and rel.relation_type == rel_type:
-                return
+        # Avoid duplicates (the adjacency index doubles as the edge membership set)
+        if self._has_edge(from_id, to_id, rel_type):
+            return
 
-        self.edges.append(Relationship(from_id, to_id, rel_type))
+        rel = Relationship(sys.intern(from_id), sys.intern(to_id), rel_type)
+        self.edges.append(rel)
+        self._index_edge(rel)
+        self._version += 1
 
     def delete_relationship(self, from_id: str, to_id: str, rel_type: Optional[RelationType] = None) -> None:
         """Delete relationship(s) between tasks"""
+        self._version += 1
         if rel_type:
+            if not self._unindex_edge(from_id, to_id, rel_type):
+                return
             self.edges = [
                 edge for edge in self.edges
                 if not (edge.from_task == from_id and edge.to_task == to_id and edge.relation_type == rel_type)
             ]
         else:
             # Delete all relationships between these tasks
+            removed = [self._unindex_edge(from_id, to_id, rt) for rt in RelationType]
+            if not any(removed):
+                return
             self.edges = [
                 edge for edge in self.edges
                 if not (edge.from_task == from_id and edge.to_task == to_id)
@@ -190,19 +345,11 @@ class TaskGraph:
 
     def get_blocking_dependencies(self, task_id: str) -> List[Task]:
         """Get tasks that block this task (must be done first)"""
-        blockers = []
-        for rel in self.edges:
-            if rel.to_task == task_id and rel.relation_type == RelationType.BLOCKS:
-                blockers.append(self.nodes[rel.from_task])
-        return blockers
+        return [self.nodes[src] for src in self._blocks_in.get(task_id, ())]
 
     def get_blocked_tasks(self, task_id: str) -> List[Task]:
         """Get tasks that this task blocks"""
-        blocked = []
-        for rel in self.edges:
-            if rel.from_task == task_id and rel.relation_type == RelationType.BLOCKS:
-                blocked.append(self.nodes[rel.to_task])
-        return blocked
+        return [self.nodes[dst] for dst in self._blocks_out.get(task_id, ())]
 
     def get_downstream_tasks(self, task_id: str) -> Set[str]:
         """
@@ -210,27 +357,55 @@ class TaskGraph:
         Returns task IDs that would be affected by completing this task.
         """
         downstream = set()
-        queue = [task_id]
+        queue = deque([task_id])
         visited = set()
 
         while queue:
-            current = queue.pop(0)
+            current = queue.popleft()
             if current in visited:
                 continue
             visited.add(current)
 
             # Find all tasks this one blocks
-            for rel in self.edges:
-                if rel.from_task == current and rel.relation_type == RelationType.BLOCKS:
-                    downstream.add(rel.to_task)
-                    queue.append(rel.to_task)
+            for succ in self._blocks_out.get(current, ()):
+                downstream.add(succ)
+                queue.append(succ)
 
         return downstream
 
+    def downstream_with_blocker_counts(self, task_id: str) -> Tuple[Set[str], Dict[str, int]]:
+        """
+        Get downstream tasks (as get_downstream_tasks) together with, for each,
+        how many incomplete blockers would remain once this task is done.
+        Both come from a single traversal of the BLOCKS index.
+        """
+        nodes = self.nodes
+        downstream = set()
+        open_blockers: Dict[str, int] = {}
+        queue = deque([task_id])
+        visited = set()
+
+        while queue:
+            current = queue.popleft()
+            if current in visited:
+                continue
+            visited.add(current)
+
+            for succ in self._blocks_out.get(current, ()):
+                if succ not in downstream:
+                    downstream.add(succ)
+                    open_blockers[succ] = sum(
+                        1 for src in self._blocks_in.get(succ, ())
+                        if src != task_id and not nodes[src].is_complete()
+                    )
+                queue.append(succ)
+
+        return downstream, open_blockers
+
     def is_blocked(self, task_id: str) -> bool:
         """Check if task is blocked by incomplete dependencies"""
-        deps = self.get_blocking_dependencies(task_id)
-        return any(not dep.is_complete() for dep in deps)
+        nodes = self.nodes
+        return any(not nodes[src].is_complete() for src in self._blocks_in.get(task_id, ()))
 
     def get_available_tasks(self) -> List[Tuple[Task, bool]]:
         """
@@ -247,36 +422,77 @@ class TaskGraph:
     def detect_cycles(self) -> List[List[str]]:
         """
         Detect cycles in the graph (only for BLOCKS relationships).
-        Returns list of cycles, where each cycle is a list of task IDs.
+        Returns one cycle per strongly connected component that contains one,
+        where each cycle is a list of task IDs ending with its first ID.
         """
+        blocks_out = self._blocks_out
         cycles = []
-        visited = set()
-        rec_stack = set()
-
-        def dfs(node: str, path: List[str]) -> None:
-            visited.add(node)
-            rec_stack.add(node)
-            path.append(node)
-
-            # Follow BLOCKS relationships
-            for edge in self.edges:
-                if edge.from_task == node and edge.relation_type == RelationType.BLOCKS:
-                    neighbor = edge.to_task
-                    if neighbor not in visited:
-                        dfs(neighbor, path.copy())
-                    elif neighbor in rec_stack:
-                        # Found a cycle
-                        cycle_start = path.index(neighbor)
-                        cycles.append(path[cycle_start:] + [neighbor])
-
-            rec_stack.remove(node)
-
-        for node_id in self.nodes.keys():
-            if node_id not in visited:
-                dfs(node_id, [])
+        index: Dict[str, int] = {}
+        lowlink: Dict[str, int] = {}
+        stack: List[str] = []
+        on_stack: Set[str] = set()
+
+        # Iterative Tarjan SCC: each work item is (node, iterator over its successors)
+        for root in self.nodes:
+            if root in index:
+                continue
+            index[root] = lowlink[root] = len(index)
+            stack.append(root)
+            on_stack.add(root)
+            work = [(root, iter(blocks_out.get(root, ())))]
+
+            while work:
+                node, successors = work[-1]
+                for neighbor in successors:
+                    if neighbor not in index:
+                        index[neighbor] = lowlink[neighbor] = len(index)
+                        stack.append(neighbor)
+                        on_stack.add(neighbor)
+                        work.append((neighbor, iter(blocks_out.get(neighbor, ()))))
+                        break
+                    if neighbor in on_stack:
+                        lowlink[node] = min(lowlink[node], index[neighbor])
+                else:
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        lowlink[parent] = min(lowlink[parent], lowlink[node])
+
+                    if lowlink[node] == index[node]:
+                        scc = set()
+                        while True:
+                            member = stack.pop()
+                            on_stack.discard(member)
+                            scc.add(member)
+                            if member == node:
+                                break
+                        if len(scc) > 1 or node in blocks_out.get(node, ()):
+                            cycles.append(self._find_cycle(node, scc))
 
         return cycles
 
+    def _find_cycle(self, start: str, scc: Set[str]) -> List[str]:
+        """Walk BLOCKS edges inside a strongly connected component back to start"""
+        blocks_out = self._blocks_out
+        path = [start]
+        visited = {start}
+        work = [iter(blocks_out.get(start, ()))]
+
+        while work:
+            for neighbor in work[-1]:
+                if neighbor == start:
+                    return path + [start]
+                if neighbor in scc and neighbor not in visited:
+                    visited.add(neighbor)
+                    path.append(neighbor)
+                    work.append(iter(blocks_out.get(neighbor, ())))
+                    break
+            else:
+                work.pop()
+                path.pop()
+
+        return path
+
     def find_orphans(self) -> List[str]:
         """Find tasks with no relationships (isolated nodes)"""
         connected = set()
@@ -287,44 +503,240 @@ class TaskGraph:
         orphans = [task_id for task_id in self.nodes.keys() if task_id not in connected]
         return orphans
 
-    def to_json(self) -> str:
-        """Serialize to JSON string"""
+    def cache_token(self) -> Tuple[int, int]:
+        """
+        Cheap token identifying this graph's current contents, for caches.
+        Changes on every add/update/delete call; tasks mutated directly
+        (bypassing update_task) are not tracked.
+        """
+        return (self._serial, self._version)
+
+    def to_json(self) -> bytes:
+        """Serialize to UTF-8 encoded JSON"""
         data = {
             "nodes": {task_id: task.to_dict() for task_id, task in self.nodes.items()},
-            "edges": [edge.to_dict() for edge in self.edges]
+            "edges": [edge.to_dict() for edge in self.edges],
+            "log_generation": self.log_generation,
         }
-        return json.dumps(data, indent=2)
+        return _dumps(data)
 
     @classmethod
-    def from_json(cls, json_str: str) -> "TaskGraph":
-        """Deserialize from JSON string"""
-        data = json.loads(json_str)
+    def from_json(cls, json_str: Union[str, bytes]) -> "TaskGraph":
+        """Deserialize from JSON string or bytes"""
+        return cls.from_dict(_loads(json_str))
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "TaskGraph":
+        """Build a graph from already-parsed JSON data"""
         graph = cls()
+        graph.log_generation = data.get("log_generation", 0)
 
         # Load nodes
         for task_id, task_data in data.get("nodes", {}).items():
             task = Task.from_dict(task_data)
-            graph.nodes[task_id] = task
+            graph.nodes[sys.intern(task_id)] = task
 
         # Load edges
         for edge_data in data.get("edges", []):
-            graph.edges.append(Relationship.from_dict(edge_data))
+            rel = Relationship.from_dict(edge_data)
+            if graph._has_edge(rel.from_task, rel.to_task, rel.relation_type):
+                continue
+            graph.edges.append(rel)
+            graph._index_edge(rel)
 
         return graph
 
     def save(self, filepath: Path) -> None:
-        """Save graph to JSON file atomically"""
-        # Write to temp file first
-        temp_path = filepath.with_suffix('.tmp')
-        with open(temp_path, 'w') as f:
-            f.write(self.to_json())
-
-        # Atomic rename
-        temp_path.replace(filepath)
+        """Save graph to JSON file atomically, starting a new log generation"""
+        self.log_generation += 1
+        try:
+            self._write_snapshot(filepath)
+        except BaseException:
+            self.log_generation -= 1
+            raise
+
+    def _write_snapshot(self, filepath: Path) -> None:
+        """Write the serialized graph via a temp file, fsync and rename"""
+        payload = memoryview(self.to_json())
+
+        # Write to a per-process temp file next to the target and flush it to disk
+        temp_path = filepath.parent / f".{filepath.name}.tmp.{os.getpid()}"
+        fd = os.open(str(temp_path), os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            while payload:
+                written = os.write(fd, payload)
+                payload = payload[written:]
+            os.fsync(fd)
+        except BaseException:
+            os.close(fd)
+            os.unlink(str(temp_path))
+            raise
+        os.close(fd)
+
+        # Atomic rename, then persist the directory entry
+        os.replace(str(temp_path), str(filepath))
+        _fsync_dir(filepath.parent)
 
     @classmethod
     def load(cls, filepath: Path) -> "TaskGraph":
         """Load graph from JSON file"""
-        with open(filepath, 'r') as f:
-            json_str = f.read()
-        return cls.from_json(json_str)
+        # Parse straight from a buffered binary stream, no intermediate str copy
+        with open(filepath, 'rb', buffering=1 << 20) as f:
+            data = orjson.loads(f.read()) if orjson is not None else json.load(f)
+        return cls.from_dict(data)
+
+    @classmethod
+    def load_view(cls, filepath: Path) -> "GraphView":
+        """Load a read-only view of a graph file without building Task objects"""
+        return GraphView(_read_json_file(filepath))
+
+    def view(self) -> "GraphView":
+        """Read-only view over this in-memory graph, converting only the tasks looked up"""
+        return _TaskGraphView(self)
+
+    def apply_op(self, op: dict) -> None:
+        """Apply one write-ahead log record to the in-memory graph"""
+        if op.get("op") == "update":
+            updates = {k: v for k, v in op.items() if k in _UPDATABLE_TASK_FIELDS}
+            self.update_task(op["id"], **updates)
+        else:
+            raise ValueError(f"Unknown log operation: {op.get('op')}")
+
+    def append_ops(self, log_path: Path, ops: List[dict]) -> None:
+        """Apply operations and append them to the write-ahead log.
+
+        All records go out in a single write followed by one fsync, tagged
+        with the current log generation.
+        """
+        for op in ops:
+            self.apply_op(op)
+
+        key = os.path.abspath(log_path)
+        fd = _LOG_FDS.get(key)
+        if fd is None:
+            fd = os.open(key, os.O_RDWR | os.O_CREAT | os.O_APPEND, 0o644)
+            # Terminate a torn trailing line so it cannot swallow the next record
+            if os.fstat(fd).st_size:
+                os.lseek(fd, -1, os.SEEK_END)
+                if os.read(fd, 1) != b"\n":
+                    os.write(fd, b"\n")
+            _LOG_FDS[key] = fd
+        gen = self.log_generation
+        payload = memoryview(b"".join(_dumps_line({**op, "gen": gen}) for op in ops))
+        while payload:
+            written = os.write(fd, payload)
+            payload = payload[written:]
+        os.fsync(fd)
+
+    def replay_log(self, log_path: Path) -> int:
+        """Re-apply write-ahead log records on top of a loaded snapshot.
+
+        Returns the number of records applied. A torn line from an interrupted
+        append is skipped. So are records left over from before the snapshot
+        was saved (a crash between saving and discarding the log): those from
+        an older log generation, or for tasks the snapshot no longer has.
+        """
+        applied = 0
+        for op in _read_log(log_path):
+            if op.get("gen", 0) != self.log_generation or op.get("id") not in self.nodes:
+                continue
+            self.apply_op(op)
+            applied += 1
+        return applied
+
+    @staticmethod
+    def discard_log(log_path: Path) -> None:
+        """Remove a write-ahead log once its records are in the snapshot"""
+        fd = _LOG_FDS.pop(os.path.abspath(log_path), None)
+        if fd is not None:
+            os.close(fd)
+        try:
+            os.unlink(str(log_path))
+        except FileNotFoundError:
+            pass
+
+
+class GraphView:
+    """Read-only view over parsed graph JSON (nodes and edges as plain dicts).
+
+    Used by query commands that only need a few tasks, so loading skips
+    Task/Relationship construction and index building for the whole graph.
+    """
+
+    def __init__(self, data: Optional[dict] = None):
+        data = data or {}
+        self.nodes: Dict[str, dict] = data.get("nodes", {})
+        self.edges: List[dict] = data.get("edges", [])
+        self.log_generation: int = data.get("log_generation", 0)
+
+    def _neighbors(self, task_id: str, key: str, other: str) -> List[dict]:
+        """Distinct BLOCKS neighbors of task_id, in edge order"""
+        ids = dict.fromkeys(
+            edge[other] for edge in self.edges
+            if edge[key] == task_id and edge["type"] == RelationType.BLOCKS.value
+        )
+        return [self.nodes[i] for i in ids]
+
+    def get_blocking_dependencies(self, task_id: str) -> List[dict]:
+        """Get tasks that block this task (must be done first)"""
+        return self._neighbors(task_id, "to", "from")
+
+    def get_blocked_tasks(self, task_id: str) -> List[dict]:
+        """Get tasks that this task blocks"""
+        return self._neighbors(task_id, "from", "to")
+
+    def apply_op(self, op: dict) -> None:
+        """Apply one write-ahead log record to the raw node data"""
+        if op.get("op") != "update":
+            raise ValueError(f"Unknown log operation: {op.get('op')}")
+        node = self.nodes[op["id"]]
+        for key, value in op.items():
+            if key in _UPDATABLE_TASK_FIELDS and key in node:
+                node[key] = value
+
+    def replay_log(self, log_path: Path) -> int:
+        """Re-apply write-ahead log records on top of the loaded snapshot"""
+        applied = 0
+        for op in _read_log(log_path):
+            if op.get("gen", 0) != self.log_generation or op.get("id") not in self.nodes:
+                continue
+            self.apply_op(op)
+            applied += 1
+        return applied
+
+
+class _TaskDicts(Mapping):
+    """Task ID -> task dict mapping over Task objects, converted on access"""
+
+    def __init__(self, tasks: Dict[str, Task]):
+        self._tasks = tasks
+
+    def __getitem__(self, task_id: str) -> dict:
+        return self._tasks[task_id].to_dict()
+
+    def __contains__(self, task_id: object) -> bool:
+        return task_id in self._tasks
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._tasks)
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+
+class _TaskGraphView(GraphView):
+    """GraphView answered from an in-memory TaskGraph and its indexes"""
+
+    def __init__(self, graph: TaskGraph):
+        super().__init__()
+        self._graph = graph
+        self.nodes = _TaskDicts(graph.nodes)
+
+    def get_blocking_dependencies(self, task_id: str) -> List[dict]:
+        return [task.to_dict() for task in self._graph.get_blocking_dependencies(task_id)]
+
+    def get_blocked_tasks(self, task_id: str) -> List[dict]:
+        return [task.to_dict() for task in self._graph.get_blocked_tasks(task_id)]
+
+    def apply_op(self, op: dict) -> None:
+        raise TypeError("Apply log records to the underlying TaskGraph instead")
@@ -3,15 +3,64 @@
 Mermaid diagram generator for task graphs
 """
 
-from typing import List, Set, Optional
+import io
+from collections import Counter, OrderedDict
+from typing import Callable, Dict, List, Optional
 from speculate.graph_engine import TaskGraph, Task, TaskStatus, RelationType
 
 
+# Status icons shown in node labels
+_ICON_MAP = {
+    TaskStatus.DONE: "✓",
+    TaskStatus.IN_PROGRESS: "⟳",
+    TaskStatus.PENDING: "○"
+}
+
+# Different arrow styles for different relationship types
+_ARROW_FMT = {
+    RelationType.BLOCKS: "  %s --> %s\n",
+    RelationType.PART_OF: "  %s -.-> %s\n",
+    RelationType.RELATES_TO: "  %s ~~~ %s\n",
+}
+
+# Style classes filled in the main render pass, in emission order
+_BUCKET_ORDER = (
+    "done", "inProgress", "pending", "ready", "blocked", "willUnblock", "stillBlocked"
+)
+
+# Base style class for each task status
+_STATUS_CLASS = {
+    TaskStatus.DONE: "done",
+    TaskStatus.IN_PROGRESS: "inProgress",
+    TaskStatus.PENDING: "pending",
+}
+
+# Classes that replace the base pending color when highlighting
+_HIGHLIGHT_CLASSES = ("ready", "blocked", "willUnblock", "stillBlocked")
+
+# classDef lines per style class (constant, so built once at import)
+_CLASS_DEFS = {
+    "done": "  classDef done fill:#90EE90,stroke:#333,stroke-width:2px",
+    "inProgress": "  classDef inProgress fill:#ADD8E6,stroke:#333,stroke-width:2px",
+    "pending": "  classDef pending fill:#F5F5DC,stroke:#333,stroke-width:2px",
+    "ready": "  classDef ready fill:#98FB98,stroke:#2E7D32,stroke-width:3px",
+    "blocked": "  classDef blocked fill:#D3D3D3,stroke:#666,stroke-width:1px",
+    "willUnblock": "  classDef willUnblock fill:#00FA9A,stroke:#006400,stroke-width:4px",
+    "stillBlocked": "  classDef stillBlocked fill:#FFE4B5,stroke:#DAA520,stroke-width:2px",
+}
+
+
+# Recently rendered diagrams keyed by (graph cache token, render flags)
+_RENDER_CACHE: "OrderedDict[tuple, str]" = OrderedDict()
+_RENDER_CACHE_SIZE = 32
+
+
 def render_mermaid(
     graph: TaskGraph,
     highlight_ready: bool = False,
     highlight_downstream: Optional[str] = None,
-    filter_pending_only: bool = False
+    filter_pending_only: bool = False,
+    cache: bool = False
 ) -> str:
     """
     Render task graph as Mermaid flowchart.
@@ -21,82 +70,145 @@ def render_mermaid(
         highlight_ready: If True, highlight ready tasks in green, dim blocked in gray
         highlight_downstream: If set, highlight downstream tasks from this task ID
         filter_pending_only: If True, only show pending tasks
+        cache: If True, reuse output keyed by the graph's cache token and flags.
+            Only safe for graphs changed solely through TaskGraph methods; direct
+            edits to tasks, nodes or edges are not seen and yield stale output
 
     Returns:
         Mermaid flowchart markdown
     """
-    lines = ["```mermaid", "graph TD"]
+    if not cache:
+        return _render(graph, highlight_ready, highlight_downstream, filter_pending_only)
+
+    key = (graph.cache_token(), highlight_ready, highlight_downstream, filter_pending_only)
+    cached = _RENDER_CACHE.get(key)
+    if cached is not None:
+        _RENDER_CACHE.move_to_end(key)
+        return cached
 
-    # Determine which tasks to include
-    tasks_to_show = {}
-    for task_id, task in graph.nodes.items():
-        if filter_pending_only and task.status != TaskStatus.PENDING:
-            continue
-        tasks_to_show[task_id] = task
+    output = _render(graph, highlight_ready, highlight_downstream, filter_pending_only)
+    _RENDER_CACHE[key] = output
+    if len(_RENDER_CACHE) > _RENDER_CACHE_SIZE:
+        _RENDER_CACHE.popitem(last=False)
+    return output
+
+
+def _render(
+    graph: TaskGraph,
+    highlight_ready: bool,
+    highlight_downstream: Optional[str],
+    filter_pending_only: bool
+) -> str:
+    """Render the flowchart (uncached)"""
+    buf = io.StringIO()
+    w = buf.write
+    w("```mermaid\ngraph TD\n")
+
+    # Determine which tasks to include (read-only alias of the graph when unfiltered)
+    if filter_pending_only:
+        pending = TaskStatus.PENDING
+        tasks_to_show = {
+            task_id: task for task_id, task in graph.nodes.items()
+            if task.status is pending
+        }
+    else:
+        tasks_to_show = graph.nodes
 
     if not tasks_to_show:
-        lines.append("  empty[\"No tasks to display\"]")
-        lines.append("```")
-        return "\n".join(lines)
+        w("  empty[\"No tasks to display\"]\n```")
+        return buf.getvalue()
 
-    # Calculate downstream tasks if needed
+    # Calculate visible downstream tasks, and how many open blockers each would
+    # keep once the highlighted task is done, in one traversal
     downstream_ids = set()
+    open_after_highlight: Dict[str, int] = {}
     if highlight_downstream and highlight_downstream in graph.nodes:
-        downstream_ids = graph.get_downstream_tasks(highlight_downstream)
+        downstream_ids, open_after_highlight = graph.downstream_with_blocker_counts(
+            highlight_downstream
+        )
+        downstream_ids &= tasks_to_show.keys()
+
+    # Count incomplete BLOCKS dependencies per task in one pass over the edges
+    open_blockers = _count_open_blockers(graph) if highlight_ready else Counter()
+
+    # Sanitize each visible task ID once and reuse it for nodes, edges and styles
+    sid = {task_id: _sanitize_id(task_id) for task_id in tasks_to_show}
+
+    # Single pass over visible tasks: emit node definitions and put each node in
+    # exactly one style class. For pending tasks the highest-priority class wins:
+    # downstream (willUnblock/stillBlocked) > ready/blocked > pending
+    buckets: Dict[str, List[str]] = {name: [] for name in _BUCKET_ORDER}
+    status_bucket = {status: buckets[name] for status, name in _STATUS_CLASS.items()}
+
+    # Bind hot-loop lookups to locals
+    pending = TaskStatus.PENDING
+    format_label = _format_node_label
+    add_pending = buckets["pending"].append
+    add_ready = buckets["ready"].append
+    add_blocked = buckets["blocked"].append
+    add_will_unblock = buckets["willUnblock"].append
+    add_still_blocked = buckets["stillBlocked"].append
+    sid_get = sid.get
+    arrow_fmt = _ARROW_FMT.get
 
-    # Render nodes with labels and styling
     for task_id, task in tasks_to_show.items():
-        label = _format_node_label(task)
-        node_def = f"  {_sanitize_id(task_id)}[\"{label}\"]"
-        lines.append(node_def)
+        node_id = sid[task_id]
+        status = task.status
+        w(f"  {node_id}[\"{format_label(task)}\"]\n")
+
+        if status is not pending:
+            status_bucket[status].append(node_id)
+        elif task_id in downstream_ids:
+            if open_after_highlight[task_id] == 0:
+                add_will_unblock(node_id)
+            else:
+                add_still_blocked(node_id)
+        elif highlight_ready:
+            if open_blockers[task_id] > 0:
+                add_blocked(node_id)
+            else:
+                add_ready(node_id)
+        else:
+            add_pending(node_id)
 
     # Render edges (only between visible tasks)
     for edge in graph.edges:
-        if edge.from_task in tasks_to_show and edge.to_task in tasks_to_show:
-            from_id = _sanitize_id(edge.from_task)
-            to_id = _sanitize_id(edge.to_task)
-
-            # Different arrow styles for different relationship types
-            if edge.relation_type == RelationType.BLOCKS:
-                lines.append(f"  {from_id} --> {to_id}")
-            elif edge.relation_type == RelationType.PART_OF:
-                lines.append(f"  {from_id} -.-> {to_id}")
-            elif edge.relation_type == RelationType.RELATES_TO:
-                lines.append(f"  {from_id} ~~~ {to_id}")
-
-    # Apply styling
-    lines.append("")
-    lines.extend(_generate_styles(
-        graph,
-        tasks_to_show,
-        highlight_ready,
-        highlight_downstream,
-        downstream_ids
-    ))
-
-    lines.append("```")
-    return "\n".join(lines)
+        from_id = sid_get(edge.from_task)
+        to_id = sid_get(edge.to_task)
+        if from_id is not None and to_id is not None:
+            fmt = arrow_fmt(edge.relation_type)
+            if fmt:
+                w(fmt % (from_id, to_id))
+
+    # Apply styling; the highlight pass only runs when a highlight was requested
+    w("\n")
+    _emit_status_styles(w, buckets)
+    if highlight_ready or downstream_ids:
+        _emit_highlight_styles(w, buckets)
+
+    w("```")
+    return buf.getvalue()
+
+
+def _count_open_blockers(graph: TaskGraph) -> Counter:
+    """Count incomplete blocking dependencies per task ID"""
+    nodes = graph.nodes
+    blocks = RelationType.BLOCKS
+    done = TaskStatus.DONE
+    open_blockers = Counter()
+    for edge in graph.edges:
+        if edge.relation_type is blocks:
+            if nodes[edge.from_task].status is not done:
+                open_blockers[edge.to_task] += 1
+    return open_blockers
 
 
 def _format_node_label(task: Task) -> str:
     """Format node label with task ID, estimate, and status icon"""
-    # Status icons
-    icon_map = {
-        TaskStatus.DONE: "✓",
-        TaskStatus.IN_PROGRESS: "⟳",
-        TaskStatus.PENDING: "○"
-    }
-    icon = icon_map.get(task.status, "○")
-
-    # Build label
-    parts = [task.id]
-
+    icon = _ICON_MAP.get(task.status, "○")
     if task.estimate_hours:
-        parts.append(f"({task.estimate_hours}h)")
-
-    parts.append(f"[{icon}]")
-
-    return " ".join(parts)
+        return "%s (%sh) [%s]" % (task.id, task.estimate_hours, icon)
+    return "%s [%s]" % (task.id, icon)
 
 
 def _sanitize_id(task_id: str) -> str:
@@ -105,100 +217,20 @@ def _sanitize_id(task_id: str) -> str:
     return task_id.replace("-", "_")
 
 
-def _generate_styles(
-    graph: TaskGraph,
-    tasks_to_show: dict,
-    highlight_ready: bool,
-    highlight_downstream: Optional[str],
-    downstream_ids: Set[str]
-) -> List[str]:
-    """Generate CSS styling for nodes"""
-    styles = []
-
-    # Status-based coloring (base layer)
-    done_nodes = []
-    in_progress_nodes = []
-    pending_nodes = []
+def _write_class(w: Callable[[str], int], name: str, node_ids: List[str]) -> None:
+    """Write a classDef and its member list, skipping empty classes"""
+    if node_ids:
+        w(_CLASS_DEFS[name])
+        w("\n  class %s %s\n" % (",".join(node_ids), name))
 
-    for task_id, task in tasks_to_show.items():
-        sanitized_id = _sanitize_id(task_id)
-
-        if task.status == TaskStatus.DONE:
-            done_nodes.append(sanitized_id)
-        elif task.status == TaskStatus.IN_PROGRESS:
-            in_progress_nodes.append(sanitized_id)
-        elif task.status == TaskStatus.PENDING:
-            pending_nodes.append(sanitized_id)
-
-    # Apply base status colors
-    if done_nodes:
-        styles.append(f"  classDef done fill:#90EE90,stroke:#333,stroke-width:2px")
-        styles.append(f"  class {','.join(done_nodes)} done")
-
-    if in_progress_nodes:
-        styles.append(f"  classDef inProgress fill:#ADD8E6,stroke:#333,stroke-width:2px")
-        styles.append(f"  class {','.join(in_progress_nodes)} inProgress")
-
-    if pending_nodes:
-        styles.append(f"  classDef pending fill:#F5F5DC,stroke:#333,stroke-width:2px")
-        styles.append(f"  class {','.join(pending_nodes)} pending")
-
-    # Highlight ready/blocked (overrides base pending color)
-    if highlight_ready:
-        ready_nodes = []
-        blocked_nodes = []
-
-        for task_id, task in tasks_to_show.items():
-            if task.status == TaskStatus.PENDING:
-                is_blocked = graph.is_blocked(task_id)
-                sanitized_id = _sanitize_id(task_id)
-
-                if is_blocked:
-                    blocked_nodes.append(sanitized_id)
-                else:
-                    ready_nodes.append(sanitized_id)
-
-        if ready_nodes:
-            styles.append(f"  classDef ready fill:#98FB98,stroke:#2E7D32,stroke-width:3px")
-            styles.append(f"  class {','.join(ready_nodes)} ready")
-
-        if blocked_nodes:
-            styles.append(f"  classDef blocked fill:#D3D3D3,stroke:#666,stroke-width:1px")
-            styles.append(f"  class {','.join(blocked_nodes)} blocked")
-
-    # Highlight downstream tasks (overrides ready/blocked)
-    if highlight_downstream and downstream_ids:
-        unblocked_downstream = []
-        still_blocked_downstream = []
-
-        for task_id in downstream_ids:
-            if task_id not in tasks_to_show:
-                continue
-
-            task = tasks_to_show[task_id]
-            if task.status != TaskStatus.PENDING:
-                continue
-
-            sanitized_id = _sanitize_id(task_id)
-
-            # Check if this task would become unblocked
-            blockers = graph.get_blocking_dependencies(task_id)
-            would_be_unblocked = all(
-                blocker.is_complete() or blocker.id == highlight_downstream
-                for blocker in blockers
-            )
-
-            if would_be_unblocked:
-                unblocked_downstream.append(sanitized_id)
-            else:
-                still_blocked_downstream.append(sanitized_id)
 
-        if unblocked_downstream:
-            styles.append(f"  classDef willUnblock fill:#00FA9A,stroke:#006400,stroke-width:4px")
-            styles.append(f"  class {','.join(unblocked_downstream)} willUnblock")
+def _emit_status_styles(w: Callable[[str], int], buckets: Dict[str, List[str]]) -> None:
+    """Write the base status colors from prebuilt buckets"""
+    for name in _STATUS_CLASS.values():
+        _write_class(w, name, buckets[name])
 
-        if still_blocked_downstream:
-            styles.append(f"  classDef stillBlocked fill:#FFE4B5,stroke:#DAA520,stroke-width:2px")
-            styles.append(f"  class {','.join(still_blocked_downstream)} stillBlocked")
 
-    return styles
+def _emit_highlight_styles(w: Callable[[str], int], buckets: Dict[str, List[str]]) -> None:
+    """Write ready/blocked and downstream highlight colors from prebuilt buckets"""
+    for name in _HIGHLIGHT_CLASSES:
+        _write_class(w, name, buckets[name])
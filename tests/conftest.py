@@ -0,0 +1,17 @@
+"""Shared pytest fixtures."""
+
+import pytest
+from click.testing import CliRunner
+
+
+@pytest.fixture(scope="session")
+def runner():
+    """One CliRunner for the whole session; invoke() isolates each call."""
+    return CliRunner()
+
+
+@pytest.fixture
+def in_tmp(tmp_path, monkeypatch):
+    """Run the test from a fresh temporary working directory."""
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
@@ -1,87 +1,346 @@
 """Tests for CLI functionality."""
 
 import json
-import tempfile
+import os
+import socket
+import subprocess
+import sys
+import time
 from pathlib import Path
-from click.testing import CliRunner
-from speculate.cli import main
 
+import pytest
+from speculate.cli import TOOL_CACHE_TTL, clear_tool_cache, detect_tools, install_packages, main
 
-def test_version():
+_SINGLE_TASK_JSON = json.dumps({"tasks": [{"id": "test-task", "estimate_hours": 1}]})
+
+
+def test_version(runner):
     """Test version option."""
-    runner = CliRunner()
     result = runner.invoke(main, ['--version'])
     assert result.exit_code == 0
     assert '0.1.0' in result.output
 
 
-def test_add_tasks():
+def test_add_tasks(runner, in_tmp):
     """Test adding tasks to graph."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        runner = CliRunner()
-        with runner.isolated_filesystem(temp_dir=tmpdir):
-            payload = json.dumps({
-                "tasks": [
-                    {"id": "design-api", "estimate_hours": 2},
-                    {"id": "implement-api", "estimate_hours": 4}
-                ],
-                "relationships": [
-                    {"from": "design-api", "to": "implement-api", "type": "blocks"}
-                ]
-            })
-            result = runner.invoke(main, ['add', payload])
-            assert result.exit_code == 0
-            assert "Added 2 task(s)" in result.output
-            assert Path(".speculate/graph.json").exists()
-
-
-def test_start_task():
+    payload = json.dumps({
+        "tasks": [
+            {"id": "design-api", "estimate_hours": 2},
+            {"id": "implement-api", "estimate_hours": 4}
+        ],
+        "relationships": [
+            {"from": "design-api", "to": "implement-api", "type": "blocks"}
+        ]
+    })
+    result = runner.invoke(main, ['add', payload])
+    assert result.exit_code == 0
+    assert "Added 2 task(s)" in result.output
+    assert Path(".speculate/graph.json").exists()
+
+
+def test_start_task(runner, in_tmp):
     """Test marking task as in_progress."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        runner = CliRunner()
-        with runner.isolated_filesystem(temp_dir=tmpdir):
-            # First add a task
-            payload = json.dumps({"tasks": [{"id": "test-task", "estimate_hours": 1}]})
-            runner.invoke(main, ['add', payload])
+    # First add a task
+    runner.invoke(main, ['add', _SINGLE_TASK_JSON])
 
-            # Then start it
-            result = runner.invoke(main, ['start', 'test-task'])
-            assert result.exit_code == 0
-            assert "Started task: test-task" in result.output
+    # Then start it
+    result = runner.invoke(main, ['start', 'test-task'])
+    assert result.exit_code == 0
+    assert "Started task: test-task" in result.output
 
 
-def test_complete_task():
+def test_complete_task(runner, in_tmp):
     """Test marking task as done."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        runner = CliRunner()
-        with runner.isolated_filesystem(temp_dir=tmpdir):
-            # Add and complete a task
-            payload = json.dumps({"tasks": [{"id": "test-task", "estimate_hours": 1}]})
-            runner.invoke(main, ['add', payload])
+    # Add and complete a task
+    runner.invoke(main, ['add', _SINGLE_TASK_JSON])
 
-            result = runner.invoke(main, ['complete', 'test-task'])
-            assert result.exit_code == 0
-            assert "Completed task: test-task" in result.output
+    result = runner.invoke(main, ['complete', 'test-task'])
+    assert result.exit_code == 0
+    assert "Completed task: test-task" in result.output
 
 
-def test_validate_empty_graph():
+def test_validate_empty_graph(runner, in_tmp):
     """Test validation on empty graph."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        runner = CliRunner()
-        with runner.isolated_filesystem(temp_dir=tmpdir):
-            result = runner.invoke(main, ['validate'])
-            assert result.exit_code == 0
-            assert "PASSED" in result.output
+    result = runner.invoke(main, ['validate'])
+    assert result.exit_code == 0
+    assert "PASSED" in result.output
 
 
-def test_invalid_task_id():
+def test_invalid_task_id(runner, in_tmp):
     """Test that invalid task IDs are rejected."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        runner = CliRunner()
-        with runner.isolated_filesystem(temp_dir=tmpdir):
-            payload = json.dumps({
-                "tasks": [{"id": "Invalid-Task-Name", "estimate_hours": 1}]
-            })
-            result = runner.invoke(main, ['add', payload])
-            assert result.exit_code == 1
-            assert "must be lowercase" in result.output
+    payload = json.dumps({
+        "tasks": [{"id": "Invalid-Task-Name", "estimate_hours": 1}]
+    })
+    result = runner.invoke(main, ['add', payload])
+    assert result.exit_code == 1
+    assert "must be lowercase" in result.output
+
+
+def test_status_updates_use_log(runner, in_tmp):
+    """Test that start/complete append to the log and compact folds it in."""
+    payload = json.dumps({"tasks": [{"id": f"task-{i}"} for i in range(20)]})
+    runner.invoke(main, ['add', payload])
+    snapshot = Path(".speculate/graph.json").read_text()
+
+    runner.invoke(main, ['start', 'task-1'])
+    assert Path(".speculate/graph.log").exists()
+    assert Path(".speculate/graph.json").read_text() == snapshot
+
+    result = runner.invoke(main, ['show', 'task-1'])
+    assert "Status: in_progress" in result.output
+
+    result = runner.invoke(main, ['compact'])
+    assert result.exit_code == 0
+    assert not Path(".speculate/graph.log").exists()
+    graph = json.loads(Path(".speculate/graph.json").read_text())
+    assert graph["nodes"]["task-1"]["status"] == "in_progress"
+
+
+def test_update_logs_in_one_write(runner, in_tmp, monkeypatch):
+    """Test that a multi-task update is one fsynced log append."""
+    payload = json.dumps({"tasks": [{"id": f"task-{i}"} for i in range(20)]})
+    runner.invoke(main, ['add', payload])
+
+    fsyncs = []
+    real_fsync = os.fsync
+    monkeypatch.setattr(os, "fsync", lambda fd: (fsyncs.append(fd), real_fsync(fd)))
+    updates = json.dumps({"tasks": [
+        {"id": "task-0", "status": "done"},
+        {"id": "task-1", "status": "in_progress", "op": "x"},
+    ]})
+    result = runner.invoke(main, ['update', updates])
+    assert result.exit_code == 0
+    assert len(fsyncs) == 1
+
+    result = runner.invoke(main, ['show', 'task-1'])
+    assert "Status: in_progress" in result.output
+
+
+def test_batch_ops(runner, in_tmp):
+    """Test applying several operations from stdin in one invocation."""
+    ops = {"ops": [
+        {"op": "add", "payload": {"tasks": [{"id": "design-api"}, {"id": "old-task"}]}},
+        {"op": "update", "payload": {"tasks": [{"id": "design-api", "status": "done"}]}},
+        {"op": "delete", "payload": {"tasks": ["old-task"]}},
+    ]}
+    result = runner.invoke(main, ['batch'], input=json.dumps(ops))
+    assert result.exit_code == 0
+    assert "Applied 3 operation(s)" in result.output
+
+    graph = json.loads(Path(".speculate/graph.json").read_text())
+    assert list(graph["nodes"]) == ["design-api"]
+    assert graph["nodes"]["design-api"]["status"] == "done"
+
+    # A failing op aborts the whole batch without saving
+    bad = {"ops": [
+        {"op": "add", "payload": {"tasks": [{"id": "new-task"}]}},
+        {"op": "update", "payload": {"tasks": [{"id": "missing-task"}]}},
+    ]}
+    result = runner.invoke(main, ['batch'], input=json.dumps(bad))
+    assert result.exit_code == 1
+    assert "Operation 2 (update): Task not found" in result.output
+    graph = json.loads(Path(".speculate/graph.json").read_text())
+    assert "new-task" not in graph["nodes"]
+
+    # Malformed records are reported per operation, not as tracebacks
+    for record, message in (
+        (1, "Operation 1: must be an object"),
+        ({"op": []}, "Operation 1: unknown op"),
+        ({"op": "add", "payload": 5}, "Operation 1 (add): payload must be an object"),
+    ):
+        result = runner.invoke(main, ['batch'], input=json.dumps({"ops": [record]}))
+        assert result.exit_code == 1
+        assert message in result.output
+
+
+def test_show_task(runner, in_tmp):
+    """Test showing task details with its dependencies."""
+    payload = json.dumps({
+        "tasks": [
+            {"id": "design-api", "estimate_hours": 2},
+            {"id": "implement-api", "description": "Build endpoints"},
+            {"id": "test-api"}
+        ],
+        "relationships": [
+            {"from": "design-api", "to": "implement-api", "type": "blocks"},
+            {"from": "implement-api", "to": "test-api", "type": "blocks"}
+        ]
+    })
+    runner.invoke(main, ['add', payload])
+    runner.invoke(main, ['complete', 'design-api'])
+
+    result = runner.invoke(main, ['show', 'implement-api'])
+    assert result.exit_code == 0
+    assert "Build endpoints" in result.output
+    assert "✓ design-api (done)" in result.output
+    assert "- test-api (pending)" in result.output
+
+    result = runner.invoke(main, ['show', 'missing-task'])
+    assert result.exit_code == 1
+
+
+_needs_unix_sockets = pytest.mark.skipif(
+    not hasattr(socket, "AF_UNIX"), reason="daemon mode requires Unix domain sockets"
+)
+
+_CLI_ENV = {**os.environ, "PYTHONPATH": str(Path(__file__).resolve().parents[1])}
+
+
+def _start_daemon(cwd: Path) -> subprocess.Popen:
+    """Launch `speculate serve` in cwd and wait for its socket."""
+    server = subprocess.Popen(
+        [sys.executable, "-m", "speculate.cli", "serve"],
+        cwd=cwd, env=_CLI_ENV, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+    )
+    sock = cwd / ".speculate" / "sock"
+    deadline = time.time() + 10
+    while not sock.exists() and time.time() < deadline:
+        time.sleep(0.05)
+    assert sock.exists()
+    return server
+
+
+def _run_cli(cwd: Path, *args, stdin=None) -> subprocess.CompletedProcess:
+    """Run speculate in a subprocess, as a client of any daemon in cwd."""
+    return subprocess.run(
+        [sys.executable, "-m", "speculate.cli", *args],
+        cwd=cwd, env=_CLI_ENV, input=stdin, capture_output=True, text=True, timeout=10
+    )
+
+
+@_needs_unix_sockets
+def test_serve_forwards_commands(tmp_path):
+    """Test that commands are answered by a running daemon."""
+    server = _start_daemon(tmp_path)
+    sock = tmp_path / ".speculate" / "sock"
+    try:
+        def run(*args, stdin=None):
+            return _run_cli(tmp_path, *args, stdin=stdin)
+
+        payload = json.dumps({"tasks": [{"id": "design-api"}, {"id": "implement-api"}]})
+        assert "Added 2 task(s)" in run("add", payload).stdout
+        assert run("start", "design-api").returncode == 0
+
+        result = run("update", json.dumps({"tasks": [{"id": "missing-task"}]}))
+        assert result.returncode == 1
+        assert "Task not found: missing-task" in result.stderr
+
+        ops = json.dumps({"ops": [{"op": "delete", "payload": {"tasks": ["implement-api"]}}]})
+        assert "Applied 1 operation(s)" in run("batch", stdin=ops).stdout
+        assert "Status: in_progress" in run("show", "design-api").stdout
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+
+    assert not sock.exists()
+    graph = json.loads((tmp_path / ".speculate" / "graph.json").read_text())
+    assert list(graph["nodes"]) == ["design-api"]
+
+
+@_needs_unix_sockets
+def test_serve_recovers_from_unreadable_graph(tmp_path):
+    """Test that the daemon keeps answering after failing to reload the graph."""
+    graph_file = tmp_path / ".speculate" / "graph.json"
+    server = _start_daemon(tmp_path)
+    try:
+        assert _run_cli(tmp_path, "add", _SINGLE_TASK_JSON).returncode == 0
+        snapshot = graph_file.read_text()
+
+        # A failed command drops the resident graph; reloading it then fails
+        graph_file.write_text("{not json")
+        assert _run_cli(tmp_path, "show", "missing-task").returncode == 1
+        result = _run_cli(tmp_path, "validate")
+        assert result.returncode == 1
+        assert "Error:" in result.stderr
+
+        graph_file.write_text(snapshot)
+        result = _run_cli(tmp_path, "start", "test-task")
+        assert result.returncode == 0
+        assert "Started task: test-task" in result.stdout
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+
+
+def test_add_reports_all_invalid_ids(runner, in_tmp):
+    """Test that add reports every invalid or duplicate task ID."""
+    payload = json.dumps({"tasks": [{"id": "Bad-Id"}, {"id": "also bad"}]})
+    result = runner.invoke(main, ['add', payload])
+    assert result.exit_code == 1
+    assert "must be lowercase: 'Bad-Id'" in result.output
+    assert "must use hyphens, not spaces: 'also bad'" in result.output
+
+    payload = json.dumps({"tasks": [{"id": "same-task"}, {"id": "same-task"}]})
+    result = runner.invoke(main, ['add', payload])
+    assert result.exit_code == 1
+    assert "repeated in payload: same-task" in result.output
+
+
+def test_detect_tools_cache(tmp_path, monkeypatch):
+    """Test that tool probes are cached until expiry, new tools or a clear."""
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    probed = []
+    monkeypatch.setattr("shutil.which", lambda tool: probed.append(tool) or f"/usr/bin/{tool}")
+
+    assert detect_tools(["rg", "jq"]) == {"rg": True, "jq": True}
+    assert sorted(probed) == ["jq", "rg"]
+
+    probed.clear()
+    assert detect_tools(["rg"]) == {"rg": True}
+    assert probed == []
+
+    # A tool missing from the cache triggers a full re-probe
+    detect_tools(["rg", "fzf"])
+    assert sorted(probed) == ["fzf", "rg"]
+
+    # So does an expired cache
+    probed.clear()
+    cache_file = tmp_path / "speculate" / "tools.json"
+    cache = json.loads(cache_file.read_text())
+    cache["checked_at"] -= TOOL_CACHE_TTL + 1
+    cache_file.write_text(json.dumps(cache))
+    detect_tools(["rg"])
+    assert probed == ["rg"]
+
+    probed.clear()
+    clear_tool_cache()
+    detect_tools(["rg"])
+    assert probed == ["rg"]
+
+
+def test_install_packages_drops_unknown(monkeypatch):
+    """Test that unknown packages are dropped and the rest installed in one retry."""
+    calls = []
+
+    def fake_run(cmd, **kwargs):
+        calls.append(cmd)
+        if "tokei" in cmd:
+            return subprocess.CompletedProcess(cmd, 100, "", "E: Unable to locate package tokei\n")
+        return subprocess.CompletedProcess(cmd, 0, "", "")
+
+    monkeypatch.setattr(subprocess, "run", fake_run)
+    monkeypatch.setattr("shutil.which", lambda tool: None)
+
+    installed = install_packages("apt install", {"rg": "ripgrep", "tokei": "tokei", "jq": "jq"})
+    assert installed == {"rg", "jq"}
+    assert calls == [
+        ["apt", "install", "ripgrep", "tokei", "jq"],
+        ["apt", "install", "ripgrep", "jq"],
+    ]
+
+
+def test_install_packages_no_retry_on_other_errors(monkeypatch):
+    """Test that failures unrelated to a package are not retried."""
+    calls = []
+
+    def fake_run(cmd, **kwargs):
+        calls.append(cmd)
+        return subprocess.CompletedProcess(
+            cmd, 100, "", "E: Could not open lock file - open (13: Permission denied)\n"
+        )
+
+    monkeypatch.setattr(subprocess, "run", fake_run)
+    monkeypatch.setattr("shutil.which", lambda tool: None)
+
+    assert install_packages("apt install", {"rg": "ripgrep", "jq": "jq"}) == set()
+    assert len(calls) == 1
@@ -0,0 +1,190 @@
+"""Tests for graph engine functionality."""
+
+import json
+
+from speculate.graph_engine import (
+    TaskGraph, Task, TaskStatus, RelationType, validate_task_id
+)
+
+
+def _chain_graph() -> TaskGraph:
+    """Build design-api -> implement-api -> test-api as a BLOCKS chain."""
+    graph = TaskGraph()
+    for task_id in ("design-api", "implement-api", "test-api"):
+        graph.add_task(Task(id=task_id))
+    graph.add_relationship("design-api", "implement-api", RelationType.BLOCKS)
+    graph.add_relationship("implement-api", "test-api", RelationType.BLOCKS)
+    return graph
+
+
+def test_blocking_queries():
+    """Test blocker/blocked lookups and ready status."""
+    graph = _chain_graph()
+    assert [t.id for t in graph.get_blocking_dependencies("implement-api")] == ["design-api"]
+    assert [t.id for t in graph.get_blocked_tasks("implement-api")] == ["test-api"]
+    assert graph.get_downstream_tasks("design-api") == {"implement-api", "test-api"}
+    assert not graph.is_blocked("design-api")
+    assert graph.is_blocked("implement-api")
+
+    graph.update_task("design-api", status=TaskStatus.DONE)
+    assert not graph.is_blocked("implement-api")
+
+
+def test_downstream_with_blocker_counts():
+    """Test downstream reachability with blockers left once the task is done."""
+    graph = _chain_graph()
+    graph.add_task(Task(id="review-api"))
+    graph.add_relationship("review-api", "test-api", RelationType.BLOCKS)
+    downstream, open_blockers = graph.downstream_with_blocker_counts("design-api")
+    assert downstream == graph.get_downstream_tasks("design-api")
+    assert open_blockers == {"implement-api": 0, "test-api": 2}
+
+
+def test_delete_cascades_to_indexes():
+    """Test that deleting tasks and relationships keeps lookups consistent."""
+    graph = _chain_graph()
+    graph.delete_task("implement-api")
+    assert graph.edges == []
+    assert graph.get_blocked_tasks("design-api") == []
+    assert graph.get_blocking_dependencies("test-api") == []
+
+    graph = _chain_graph()
+    graph.delete_relationship("design-api", "implement-api")
+    assert len(graph.edges) == 1
+    assert not graph.is_blocked("implement-api")
+
+
+def test_update_ignores_unknown_fields():
+    """Test that updates skip methods, the ID and keys that are not Task fields."""
+    graph = _chain_graph()
+    graph.update_task("design-api", status="done", is_complete=False, task_id="x", id="renamed")
+    graph.apply_op({"op": "update", "id": "test-api", "checklist_progress": 1, "gen": 0, "description": "Run it"})
+    assert graph.nodes["design-api"].is_complete()
+    assert graph.nodes["design-api"].id == "design-api"
+    assert graph.nodes["test-api"].description == "Run it"
+
+
+def test_cache_token_tracks_mutations():
+    """Test that the cache token changes on edits and differs between graphs."""
+    graph = _chain_graph()
+    token = graph.cache_token()
+    assert graph.cache_token() == token
+    graph.update_task("design-api", status=TaskStatus.DONE)
+    assert graph.cache_token() != token
+
+    token = graph.cache_token()
+    graph.delete_relationship("design-api", "implement-api")
+    assert graph.cache_token() != token
+    assert _chain_graph().cache_token() != _chain_graph().cache_token()
+
+
+def test_json_roundtrip_rebuilds_indexes():
+    """Test that a deserialized graph answers dependency queries."""
+    graph = TaskGraph.from_json(_chain_graph().to_json())
+    assert graph.get_downstream_tasks("design-api") == {"implement-api", "test-api"}
+    assert graph.is_blocked("test-api")
+
+
+def test_view_matches_file_view(tmp_path):
+    """Test that a view over an in-memory graph answers like a loaded one."""
+    graph = _chain_graph()
+    graph.update_task("design-api", status=TaskStatus.DONE)
+    graph.save(tmp_path / "graph.json")
+
+    for view in (graph.view(), TaskGraph.load_view(tmp_path / "graph.json")):
+        assert "implement-api" in view.nodes and "missing-task" not in view.nodes
+        assert view.nodes["implement-api"]["status"] == "pending"
+        assert [t["id"] for t in view.get_blocking_dependencies("implement-api")] == ["design-api"]
+        assert view.get_blocking_dependencies("implement-api")[0]["status"] == "done"
+        assert [t["id"] for t in view.get_blocked_tasks("implement-api")] == ["test-api"]
+
+
+def test_detect_cycles():
+    """Test cycle detection on BLOCKS edges, including self-loops."""
+    graph = _chain_graph()
+    assert graph.detect_cycles() == []
+
+    graph.add_relationship("test-api", "design-api", RelationType.BLOCKS)
+    graph.add_task(Task(id="loop-task"))
+    graph.add_relationship("loop-task", "loop-task", RelationType.BLOCKS)
+    cycles = graph.detect_cycles()
+    assert len(cycles) == 2
+    assert ["loop-task", "loop-task"] in cycles
+    chain = next(c for c in cycles if c[0] != "loop-task")
+    assert chain[0] == chain[-1]
+    assert set(chain) == {"design-api", "implement-api", "test-api"}
+
+
+def test_save_and_load(tmp_path):
+    """Test atomic save leaves only the graph file and loads back intact."""
+    filepath = tmp_path / "graph.json"
+    _chain_graph().save(filepath)
+    assert [p.name for p in tmp_path.iterdir()] == ["graph.json"]
+
+    graph = TaskGraph.load(filepath)
+    assert list(graph.nodes) == ["design-api", "implement-api", "test-api"]
+    assert len(graph.edges) == 2
+
+
+def test_validate_task_id():
+    """Test task ID naming rules."""
+    assert validate_task_id("design-api") == (True, None)
+    assert validate_task_id("fix-bug-123") == (True, None)
+    assert "lowercase" in validate_task_id("Design-API")[1]
+    assert "hyphens" in validate_task_id("design api")[1]
+    assert "kebab-case" in validate_task_id("design-api\n")[1]
+    assert "max 4" in validate_task_id("one-two-three-four-five")[1]
+
+
+def test_duplicate_relationships_ignored():
+    """Test that repeated edges are stored once, including on load."""
+    graph = _chain_graph()
+    graph.add_relationship("design-api", "implement-api", RelationType.BLOCKS)
+    graph.add_relationship("design-api", "implement-api", RelationType.RELATES_TO)
+    assert len(graph.edges) == 3
+
+    data = json.loads(graph.to_json())
+    data["edges"].append(data["edges"][0])
+    assert len(TaskGraph.from_dict(data).edges) == 3
+
+
+def test_replay_skips_records_folded_into_snapshot(tmp_path):
+    """Test that a log left behind by an interrupted save is not replayed."""
+    graph_file, log_file = tmp_path / "graph.json", tmp_path / "graph.log"
+    graph = _chain_graph()
+    graph.save(graph_file)
+    graph.append_ops(log_file, [
+        {"op": "update", "id": "test-api", "status": "in_progress"},
+        {"op": "update", "id": "design-api", "status": "done"},
+    ])
+    # Later edits saved without discarding the log, as after a crash
+    graph.update_task("design-api", status=TaskStatus.PENDING)
+    graph.delete_task("test-api")
+    graph.save(graph_file)
+
+    loaded = TaskGraph.load(graph_file)
+    assert loaded.replay_log(log_file) == 0
+    assert loaded.nodes["design-api"].status == TaskStatus.PENDING
+
+    loaded.append_ops(log_file, [{"op": "update", "id": "implement-api", "status": "done"}])
+    assert TaskGraph.load(graph_file).replay_log(log_file) == 1
+
+    view = TaskGraph.load_view(graph_file)
+    assert view.replay_log(log_file) == 1
+    assert view.nodes["design-api"]["status"] == "pending"
+    assert view.nodes["implement-api"]["status"] == "done"
+    TaskGraph.discard_log(log_file)
+
+
+def test_append_after_torn_line(tmp_path):
+    """Test that a record appended after a torn line is not lost."""
+    graph_file, log_file = tmp_path / "graph.json", tmp_path / "graph.log"
+    graph = _chain_graph()
+    graph.save(graph_file)
+    log_file.write_bytes(b'{"op":"update","id":"test-api","sta')
+
+    graph.append_ops(log_file, [{"op": "update", "id": "design-api", "status": "done"}])
+    loaded = TaskGraph.load(graph_file)
+    assert loaded.replay_log(log_file) == 1
+    assert loaded.nodes["design-api"].status == TaskStatus.DONE
+    TaskGraph.discard_log(log_file)
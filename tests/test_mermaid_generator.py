@@ -0,0 +1,86 @@
+"""Tests for Mermaid diagram generation."""
+
+from speculate.graph_engine import TaskGraph, Task, TaskStatus, RelationType
+from speculate.mermaid_generator import render_mermaid
+
+
+def _sample_graph() -> TaskGraph:
+    """design-api blocks implement-api and write-docs; test-api needs both."""
+    graph = TaskGraph()
+    graph.add_task(Task(id="design-api", estimate_hours=2))
+    graph.add_task(Task(id="implement-api"))
+    graph.add_task(Task(id="write-docs"))
+    graph.add_task(Task(id="test-api", status=TaskStatus.IN_PROGRESS))
+    graph.add_task(Task(id="ship-it"))
+    graph.add_relationship("design-api", "implement-api", RelationType.BLOCKS)
+    graph.add_relationship("design-api", "write-docs", RelationType.BLOCKS)
+    graph.add_relationship("write-docs", "ship-it", RelationType.BLOCKS)
+    graph.add_relationship("implement-api", "ship-it", RelationType.BLOCKS)
+    graph.add_relationship("write-docs", "implement-api", RelationType.RELATES_TO)
+    graph.add_relationship("test-api", "ship-it", RelationType.PART_OF)
+    return graph
+
+
+def _class_members(output: str, class_name: str) -> set:
+    """Collect node IDs assigned to a class in the rendered diagram."""
+    for line in output.splitlines():
+        if line.startswith("  class ") and line.endswith(f" {class_name}"):
+            return set(line.split()[1].split(","))
+    return set()
+
+
+def test_render_nodes_and_edges():
+    """Test node labels and arrow styles per relationship type."""
+    output = render_mermaid(_sample_graph())
+    assert output.startswith("```mermaid\ngraph TD\n")
+    assert output.endswith("```")
+    assert '  design_api["design-api (2h) [○]"]' in output
+    assert '  test_api["test-api [⟳]"]' in output
+    assert "  design_api --> implement_api" in output
+    assert "  write_docs ~~~ implement_api" in output
+    assert "  test_api -.-> ship_it" in output
+
+
+def test_render_ready_and_blocked():
+    """Test ready/blocked highlighting of pending tasks."""
+    output = render_mermaid(_sample_graph(), highlight_ready=True, filter_pending_only=True)
+    assert "test_api" not in output
+    assert _class_members(output, "ready") == {"design_api"}
+    assert _class_members(output, "blocked") == {"implement_api", "write_docs", "ship_it"}
+    assert _class_members(output, "pending") == set()
+
+
+def test_render_downstream():
+    """Test which downstream tasks completing a task would unblock."""
+    output = render_mermaid(_sample_graph(), highlight_downstream="design-api")
+    assert _class_members(output, "willUnblock") == {"implement_api", "write_docs"}
+    assert _class_members(output, "stillBlocked") == {"ship_it"}
+    # Each pending node gets a single class; downstream ones drop the base color
+    assert _class_members(output, "pending") == {"design_api"}
+
+
+def test_render_empty():
+    """Test placeholder output when nothing is visible."""
+    output = render_mermaid(TaskGraph())
+    assert 'empty["No tasks to display"]' in output
+
+
+def test_render_reflects_graph_changes():
+    """Test that cached renders are invalidated when the graph changes."""
+    graph = _sample_graph()
+    first = render_mermaid(graph, highlight_ready=True, cache=True)
+    assert render_mermaid(graph, highlight_ready=True, cache=True) == first
+
+    graph.update_task("design-api", status=TaskStatus.DONE)
+    changed = render_mermaid(graph, highlight_ready=True, cache=True)
+    assert changed != first
+    assert "implement_api" in _class_members(changed, "ready")
+
+
+def test_render_uncached_by_default():
+    """Test that direct task edits show up without opting into the cache."""
+    graph = _sample_graph()
+    render_mermaid(graph, highlight_ready=True)
+    graph.nodes["design-api"].status = TaskStatus.DONE
+    output = render_mermaid(graph, highlight_ready=True)
+    assert "implement_api" in _class_members(output, "ready")